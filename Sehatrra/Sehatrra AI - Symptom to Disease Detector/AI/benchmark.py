@@ -0,0 +1,248 @@
+# ==============================================
+# Disease Predictor - Benchmark
+# ==============================================
+# Builds a synthetic symptom CSV (diseases x symptoms), runs the training and
+# prediction steps on it and writes timings, peak RSS and accuracy as JSON.
+# Data prep and model settings come from train.py, so a change there shows up
+# here. With --baseline it compares against an earlier run with the same
+# settings and exits non-zero when latency or accuracy regressed past the
+# thresholds. Runs fully offline.
+#
+# Usage:
+#   python benchmark.py --diseases 200 --symptoms 1000 --output bench.json
+#   python benchmark.py --search-results search_results.json   # benchmark the best searched config
+#   python benchmark.py --baseline bench.json --max-latency-regression 0.2
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+
+import joblib
+import pandas as pd
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+
+from disease_predictor import (
+    DISEASE_COL, REMEDY_COL, HARM_COL,
+    load_dataset, augment_combinations, load_artifacts, predict_from_symptoms,
+)
+from train import DEFAULT_CONFIG, build_training_data, make_vectorizer, make_model, best_config
+
+# metrics where a bigger number is worse, checked against the baseline
+LATENCY_METRICS = ['single_p50_ms', 'single_p95_ms', 'batch_ms_per_item', 'artifact_load_s']
+# command line options that don't change what is measured
+NOT_CONFIG = ('output', 'baseline', 'max_latency_regression', 'max_accuracy_drop', 'search_results')
+
+
+# -------------------------
+# 1) Synthetic dataset
+# -------------------------
+def make_synthetic_csv(path, n_diseases=100, n_symptoms=500, symptoms_per_disease=8,
+                       rows_per_disease=5, seed=42):
+    rng = random.Random(seed)
+    symptoms = [f"sym{i:05d}" for i in range(n_symptoms)]
+    rows = []
+    for d in range(n_diseases):
+        own = rng.sample(symptoms, min(symptoms_per_disease, n_symptoms))
+        for _ in range(rows_per_disease):
+            picked = rng.sample(own, rng.randint(2, min(5, len(own))))
+            rows.append({
+                'Symptoms': ', '.join(picked),
+                DISEASE_COL: f"disease{d:04d}",
+                REMEDY_COL: f"remedy for disease{d:04d}",
+                HARM_COL: d % 4,
+            })
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return path
+
+
+# -------------------------
+# 2) Helpers
+# -------------------------
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def timed_best(repeats, fn, *args, **kwargs):
+    # single-shot timings are too noisy to gate on; like timeit, keep the fastest
+    best = None
+    for _ in range(repeats):
+        result, t = timed(fn, *args, **kwargs)
+        best = t if best is None else min(best, t)
+    return result, best
+
+def time_per_call(repeats, fn):
+    # for calls of a few ms: loop each sample until it takes >= 0.2 s (timeit's
+    # autorange), then keep the fastest sample
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeats, number)) / number
+
+def percentile(values, pct):
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, round(pct / 100 * (len(values) - 1))))
+    return values[k]
+
+def peak_rss_mb():
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# -------------------------
+# 3) Run the benchmark
+# -------------------------
+def model_config(args):
+    if args.search_results:
+        return best_config(args.search_results)
+    return {'ngram_range': tuple(args.ngram_range), 'C': args.C, 'solver': args.solver}
+
+def run(args, workdir):
+    random.seed(args.seed)
+    config = model_config(args)
+    csv_path = make_synthetic_csv(
+        os.path.join(workdir, "data.csv"), args.diseases, args.symptoms,
+        args.symptoms_per_disease, args.rows_per_disease, args.seed,
+    )
+    df = load_dataset(csv_path)
+    results = {}
+
+    _, results['augment_s'] = timed(augment_combinations, df, max_per_disease=args.max_per_disease)
+    # the training data itself is built exactly like train.py does it
+    _, X_text, y = build_training_data(csv_path, args.max_per_disease, args.seed)
+
+    vectorizer = make_vectorizer(config['ngram_range'])
+    X, results['vectorizer_fit_s'] = timed(vectorizer.fit_transform, X_text)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, stratify=y, random_state=args.seed
+    )
+    model = make_model(config)
+    _, results['model_fit_s'] = timed(model.fit, X_train, y_train)
+    results['accuracy'] = float(accuracy_score(y_test, model.predict(X_test)))
+
+    # artifact round trip
+    model_path = os.path.join(workdir, "disease_model.pkl")
+    vectorizer_path = os.path.join(workdir, "vectorizer.pkl")
+    joblib.dump(model, model_path)
+    joblib.dump(vectorizer, vectorizer_path)
+    (model, vectorizer), results['artifact_load_s'] = timed_best(
+        args.repeats, load_artifacts, model_path, vectorizer_path)
+
+    # single-request latency; the tail of one pass is mostly scheduler noise, so
+    # the pass is repeated and the lowest p50/p95 kept
+    queries = [', '.join(L) for L in df['symptom_list'].sample(
+        n=args.requests, replace=True, random_state=args.seed)]
+    for q in queries[:args.warmup]:
+        predict_from_symptoms(q, model, vectorizer, df)
+    p50s, p95s = [], []
+    for _ in range(args.repeats):
+        latencies = []
+        for q in queries:
+            _, t = timed(predict_from_symptoms, q, model, vectorizer, df)
+            latencies.append(t * 1000)
+        p50s.append(statistics.median(latencies))
+        p95s.append(percentile(latencies, 95))
+    results['single_p50_ms'] = min(p50s)
+    results['single_p95_ms'] = min(p95s)
+
+    # batch throughput (vectorize + predict the whole batch at once)
+    batch = [' '.join(L) for L in df['symptom_list'].sample(
+        n=args.batch_size, replace=True, random_state=args.seed)]
+    t = time_per_call(args.repeats, lambda: model.predict(vectorizer.transform(batch)))
+    results['batch_ms_per_item'] = t * 1000 / len(batch)
+    results['batch_items_per_s'] = len(batch) / t
+
+    results['peak_rss_mb'] = peak_rss_mb()
+    settings = {k: v for k, v in vars(args).items() if k not in NOT_CONFIG}
+    settings.update(ngram_range=list(config['ngram_range']), C=config['C'], solver=config['solver'])
+    return {
+        'config': settings,
+        'environment': {'python': platform.python_version(), 'machine': platform.machine()},
+        'results': results,
+    }
+
+
+# -------------------------
+# 4) Compare with a baseline run
+# -------------------------
+def config_differences(current, baseline):
+    cur, base = current['config'], baseline.get('config', {})
+    return [f"{k}: {base.get(k)!r} -> {cur.get(k)!r}"
+            for k in sorted(set(cur) | set(base)) if cur.get(k) != base.get(k)]
+
+def check_regressions(current, baseline, max_latency_regression, max_accuracy_drop):
+    failures = []
+    cur, base = current['results'], baseline['results']
+    for key in LATENCY_METRICS:
+        if key in cur and base.get(key):
+            change = (cur[key] - base[key]) / base[key]
+            if change > max_latency_regression:
+                failures.append(f"{key}: {base[key]:.4g} -> {cur[key]:.4g} (+{change:.0%})")
+    if 'accuracy' in base and base['accuracy'] - cur['accuracy'] > max_accuracy_drop:
+        failures.append(f"accuracy: {base['accuracy']:.4f} -> {cur['accuracy']:.4f}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the disease predictor on synthetic data")
+    parser.add_argument('--diseases', type=int, default=100)
+    parser.add_argument('--symptoms', type=int, default=500)
+    parser.add_argument('--symptoms-per-disease', type=int, default=8)
+    parser.add_argument('--rows-per-disease', type=int, default=5)
+    parser.add_argument('--max-per-disease', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeats', type=int, default=5,
+                        help="repeat latency, batch and load timings, report the fastest")
+    parser.add_argument('--ngram-range', type=int, nargs=2, default=list(DEFAULT_CONFIG['ngram_range']))
+    parser.add_argument('--C', type=float, default=DEFAULT_CONFIG['C'])
+    parser.add_argument('--solver', default=DEFAULT_CONFIG['solver'])
+    parser.add_argument('--search-results',
+                        help="search_results.json from train.py; benchmarks its best config")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', help="earlier results JSON to compare against")
+    parser.add_argument('--max-latency-regression', type=float, default=0.2,
+                        help="allowed relative slowdown, e.g. 0.2 = 20%%")
+    parser.add_argument('--max-accuracy-drop', type=float, default=0.01,
+                        help="allowed absolute accuracy drop")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="sehatrra_bench_") as workdir:
+        report = run(args, workdir)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    for key, value in report['results'].items():
+        print(f"{key:>20}: {value:.4f}")
+    print("Results ->", args.output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        differences = config_differences(report, baseline)
+        if differences:
+            print("Not comparable with", args.baseline, "- settings differ:")
+            for line in differences:
+                print("  " + line)
+            sys.exit(2)
+        failures = check_regressions(report, baseline, args.max_latency_regression,
+                                     args.max_accuracy_drop)
+        if failures:
+            print("Regressions against", args.baseline)
+            for line in failures:
+                print("  " + line)
+            sys.exit(1)
+        print("No regressions against", args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# ==============================================
+# Disease Predictor - shared helpers
+# (same steps as Untitled2.ipynb, usable outside Colab)
+# ==============================================
+
+import os
+import re, itertools, random
+
+import numpy as np
+import pandas as pd
+import joblib
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(HERE, "disease_model.pkl")
+VECTORIZER_PATH = os.path.join(HERE, "vectorizer.pkl")
+DISEASE_INFO_PATH = os.path.join(HERE, "disease_info.pkl")
+
+DISEASE_COL = 'Possible Disease'
+REMEDY_COL = 'Remedies (first-aid style)'
+HARM_COL = 'Harm Scale (0=safe,3=serious)'
+
+
+# -------------------------
+# Load and parse dataset
+# -------------------------
+def parse_symptoms(s):
+    if pd.isna(s):
+        return []
+    parts = re.split(r'[;,/|]+', str(s))
+    return [t.strip().lower() for t in parts if t.strip()]
+
+def load_dataset(csv_path):
+    df = pd.read_csv(csv_path)
+    df.columns = df.columns.str.strip().str.replace('\ufeff', '')
+    if 'Symptoms' not in df.columns:
+        raise KeyError("CSV must contain a 'Symptoms' column!")
+    df['symptom_list'] = df['Symptoms'].apply(parse_symptoms)
+    df['symptom_text'] = df['symptom_list'].apply(lambda L: ' '.join(L))
+    return df
+
+
+# -------------------------
+# Augment dataset (permute symptoms to help learning)
+# -------------------------
+def augment_combinations(df, max_per_disease=50):
+    rows = []
+    for disease, g in df.groupby(DISEASE_COL):
+        symptom_pool = set()
+        for L in g['symptom_list']:
+            symptom_pool.update(L)
+        # sorted: set order changes with hash randomization, so random.seed alone
+        # wouldn't make the shuffle below (or the TF-IDF cache key) reproducible
+        symptom_pool = sorted(symptom_pool)
+        # include original
+        for L in g['symptom_list']:
+            rows.append({'symptom_text':' '.join(L), DISEASE_COL: disease})
+        # make synthetic combos
+        combos = []
+        for r in range(1, min(4, len(symptom_pool)+1)):
+            combos += list(itertools.combinations(symptom_pool, r))
+        random.shuffle(combos)
+        for i, comb in enumerate(combos):
+            if i >= max_per_disease:
+                break
+            rows.append({'symptom_text':' '.join(comb), DISEASE_COL: disease})
+    return pd.DataFrame(rows)
+
+
+# -------------------------
+# Saved model + vectorizer
+# -------------------------
+def load_artifacts(model_path=MODEL_PATH, vectorizer_path=VECTORIZER_PATH):
+    model = joblib.load(model_path)
+    vectorizer = joblib.load(vectorizer_path)
+    return model, vectorizer
+
+
+# remedy/harm per disease + known symptoms, so serving doesn't need the CSV
+def build_disease_info(df):
+    diseases = {}
+    for disease, g in df.groupby(DISEASE_COL):
+        row = g.iloc[0]
+        diseases[disease] = {
+            'remedy': str(row.get(REMEDY_COL, 'No remedy available')),
+            'harm_scale': str(row.get(HARM_COL, 'Unknown')),
+        }
+    symptoms = sorted({s for L in df['symptom_list'] for s in L})
+    return {'diseases': diseases, 'symptoms': symptoms}
+
+def load_disease_info(path=DISEASE_INFO_PATH):
+    return joblib.load(path)
+
+
+# -------------------------
+# Prediction
+# -------------------------
+def predict_from_symptoms(symptom_text, model, vectorizer, df, matcher=None):
+    # matcher (symptom_matcher.SymptomMatcher) fixes typos/synonyms first
+    tokens = matcher.normalize(symptom_text) if matcher else parse_symptoms(symptom_text)
+    text = ' '.join(tokens)
+    vec = vectorizer.transform([text])
+    disease = model.predict(vec)[0]
+    # remedy/harm lookup
+    row = df[df[DISEASE_COL] == disease].iloc[0]
+    remedy = row.get(REMEDY_COL, 'No remedy available')
+    harm = row.get(HARM_COL, 'Unknown')
+    return f"Disease: {disease}\nRemedy: {remedy}\nHarm Scale: {harm}"
+
+def predict_top_k(symptom_texts, model, vectorizer, disease_info, k=3, matcher=None):
+    # batch version for serving: one transform + predict_proba for all inputs
+    token_lists = [matcher.normalize(t) if matcher else parse_symptoms(t) for t in symptom_texts]
+    vec = vectorizer.transform([' '.join(tokens) for tokens in token_lists])
+    proba = model.predict_proba(vec)
+    # inputs with no symptom the vectorizer knows are all-zero rows; any
+    # "prediction" for them would just be the class priors
+    known = vec.getnnz(axis=1) > 0
+    k = max(1, min(k, proba.shape[1]))
+    top = np.argsort(-proba, axis=1)[:, :k]
+    results = []
+    for tokens, row, idx, has_known in zip(token_lists, proba, top, known):
+        predictions = []
+        for i in (idx if has_known else []):
+            disease = model.classes_[i]
+            info = disease_info['diseases'].get(disease, {})
+            predictions.append({
+                'disease': str(disease),
+                'probability': float(row[i]),
+                'remedy': info.get('remedy', 'No remedy available'),
+                'harm_scale': info.get('harm_scale', 'Unknown'),
+            })
+        results.append({'symptoms': tokens, 'predictions': predictions})
+    return results
@@ -0,0 +1,194 @@
+# ==============================================
+# Disease Predictor - Symptom Matcher
+# ==============================================
+# Maps misspelled / synonym symptoms ("feaver", "loose motions") to a symptom
+# the model was trained on, so the TF-IDF vectorizer doesn't silently drop them.
+#
+# Lookup order for every symptom:
+#   1. exact match against the training vocabulary
+#   2. synonym table
+#   3. if every word is already known, keep it as it is - known words are
+#      never rewritten into a different symptom
+#   4. otherwise replace only the unknown words with their nearest known word,
+#      found via a character trigram inverted index (only the few best
+#      candidates get a real edit-distance check), then retry 1-2
+# Anything still unknown is passed through unchanged.
+
+import re
+from collections import Counter
+from functools import lru_cache
+
+from disease_predictor import parse_symptoms
+
+# common layman phrasings -> symptom names usually found in the dataset
+SYNONYMS = {
+    'loose motion': 'diarrhea',
+    'loose motions': 'diarrhea',
+    'loose stools': 'diarrhea',
+    'running stomach': 'diarrhea',
+    'temperature': 'fever',
+    'high temperature': 'high fever',
+    'feverish': 'fever',
+    'throwing up': 'vomiting',
+    'puking': 'vomiting',
+    'feeling sick': 'nausea',
+    'queasy': 'nausea',
+    'head ache': 'headache',
+    'head pain': 'headache',
+    'tummy ache': 'stomach pain',
+    'stomach ache': 'stomach pain',
+    'belly pain': 'abdominal pain',
+    'blocked nose': 'nasal congestion',
+    'stuffy nose': 'nasal congestion',
+    'short of breath': 'shortness of breath',
+    'breathlessness': 'shortness of breath',
+    'tiredness': 'fatigue',
+    'tired': 'fatigue',
+    'weakness': 'fatigue',
+    'itchy skin': 'itching',
+    'itchiness': 'itching',
+    'dizzy': 'dizziness',
+    'giddiness': 'dizziness',
+    'body ache': 'body pain',
+    'body aches': 'body pain',
+    'shivering': 'chills',
+}
+
+
+def _normalize(text):
+    return re.sub(r'\s+', ' ', text.strip().lower())
+
+def _trigrams(term):
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def edit_distance(a, b, limit):
+    # Levenshtein distance, giving up (returns limit + 1) once it exceeds limit
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        if min(cur) > limit:
+            return limit + 1
+        prev = cur
+    return prev[-1]
+
+
+# -------------------------
+# Trigram inverted index over one vocabulary
+# -------------------------
+class NgramIndex:
+    # postings are split by term length: a term can only be within the edit
+    # limit if its length is, so a query only looks at the few nearby lengths
+    extra_probes = 3
+
+    def __init__(self, terms):
+        self.terms = sorted(set(terms))
+        self.term_grams = []
+        self.postings = {}    # length -> trigram -> [term ids]
+        for term_id, term in enumerate(self.terms):
+            grams = _trigrams(term)
+            self.term_grams.append(grams)
+            by_gram = self.postings.setdefault(len(term), {})
+            for g in grams:
+                by_gram.setdefault(g, []).append(term_id)
+
+    def nearest(self, query, min_similarity=0.4, candidates=5, min_length=4):
+        # very short words match too many things to guess safely
+        if len(query) < min_length:
+            return None
+        grams = _trigrams(query)
+        # up to 1 edit for 4-5 letter words, 2 for longer ones. Most typos are a
+        # single edit, so try that first and only widen the search (more
+        # lengths, more trigrams to look up) when it finds nothing.
+        max_distance = 1 if len(query) <= 5 else 2
+        for limit in range(1, max_distance + 1):
+            found = self._nearest_within(query, grams, limit, min_similarity, candidates)
+            if found:
+                return found
+        return None
+
+    def _nearest_within(self, query, grams, limit, min_similarity, candidates):
+        bands = [self.postings[n] for n in range(len(query) - limit, len(query) + limit + 1)
+                 if n in self.postings]
+        # One edit breaks at most 3 trigrams, so a term within `limit` edits
+        # misses at most 3 * limit of the query's trigrams. Counting hits over
+        # only the rarest few (3 * limit + 1 + extra_probes) therefore needs at
+        # least extra_probes + 1 of them, and skips the huge posting lists of
+        # common trigrams like "ain".
+        min_shared = len(grams) - 3 * limit
+        probe = sorted(grams, key=lambda g: sum(len(b.get(g, ())) for b in bands))
+        probe = probe[:3 * limit + 1 + self.extra_probes]
+        hits = Counter()
+        for by_gram in bands:
+            for g in probe:
+                posting = by_gram.get(g)
+                if posting:
+                    hits.update(posting)
+        min_hits = len(probe) - 3 * limit
+
+        # Dice similarity on trigram sets, then verify the best few by edit distance
+        scored = []
+        for term_id, h in hits.items():
+            if h < min_hits:
+                continue
+            term_grams = self.term_grams[term_id]
+            n = len(grams & term_grams)
+            if n < min_shared:
+                continue
+            dice = 2 * n / (len(grams) + len(term_grams))
+            if dice >= min_similarity:
+                scored.append((dice, term_id))
+        scored.sort(reverse=True)
+
+        best, best_dist = None, limit + 1
+        for _, term_id in scored[:candidates]:
+            term = self.terms[term_id]
+            dist = edit_distance(query, term, limit)
+            if dist < best_dist:
+                best, best_dist = term, dist
+        return best
+
+
+# -------------------------
+# Symptom matcher used before vectorizing
+# -------------------------
+class SymptomMatcher:
+    def __init__(self, vocabulary, synonyms=None, cache_size=10000):
+        self.phrases = {_normalize(p) for p in vocabulary if p and p.strip()}
+        self.synonyms = {_normalize(k): _normalize(v) for k, v in {**SYNONYMS, **(synonyms or {})}.items()}
+        # synonym words count as known too, so "loose motins" can still reach "loose motions"
+        self.words = {w for p in self.phrases | set(self.synonyms) for w in p.split()}
+        self.word_index = NgramIndex(self.words)
+        self.match = lru_cache(maxsize=cache_size)(self._match)
+
+    @classmethod
+    def from_dataframe(cls, df, synonyms=None):
+        vocabulary = {s for L in df['symptom_list'] for s in L}
+        return cls(vocabulary, synonyms)
+
+    def _lookup(self, phrase):
+        if phrase in self.phrases:
+            return phrase
+        canonical = self.synonyms.get(phrase)
+        if canonical in self.phrases:
+            return canonical
+        return None
+
+    def _match(self, symptom):
+        phrase = _normalize(symptom)
+        found = self._lookup(phrase)
+        if found:
+            return found
+        words = phrase.split()
+        if all(w in self.words for w in words):
+            return phrase
+        # fix only the words we have never seen
+        fixed = ' '.join(w if w in self.words else (self.word_index.nearest(w) or w) for w in words)
+        return self._lookup(fixed) or fixed
+
+    def normalize(self, symptom_text):
+        return [self.match(s) for s in parse_symptoms(symptom_text)]
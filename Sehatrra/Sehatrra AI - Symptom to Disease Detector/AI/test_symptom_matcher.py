@@ -0,0 +1,29 @@
+from symptom_matcher import SymptomMatcher
+
+VOCAB = ['neck pain', 'lower back ache', 'red eyes', 'fever', 'high fever', 'cough',
+         'diarrhea', 'stomach pain', 'shortness of breath']
+
+
+def test_known_words_are_never_rewritten():
+    matcher = SymptomMatcher(VOCAB)
+    assert matcher.normalize("back pain") == ['back pain']
+    assert matcher.normalize("severe back pain x") == ['severe back pain x']
+
+
+def test_only_unknown_words_are_corrected():
+    matcher = SymptomMatcher(VOCAB)
+    assert matcher.normalize("feaver, coughh") == ['fever', 'cough']
+    assert matcher.normalize("stomache pain") == ['stomach pain']
+    assert matcher.normalize("shortnes of breath") == ['shortness of breath']
+    assert matcher.normalize("back painn") == ['back pain']
+
+
+def test_synonyms():
+    matcher = SymptomMatcher(VOCAB)
+    assert matcher.normalize("loose motions, high temperature") == ['diarrhea', 'high fever']
+    assert matcher.normalize("loose motins") == ['diarrhea']
+
+
+def test_unknown_symptoms_pass_through():
+    matcher = SymptomMatcher(VOCAB)
+    assert matcher.normalize("xyzzy") == ['xyzzy']
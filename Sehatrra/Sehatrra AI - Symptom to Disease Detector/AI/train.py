@@ -0,0 +1,214 @@
+# ==============================================
+# Disease Predictor - Training Pipeline
+# ==============================================
+# Vectorizes the augmented dataset once per n-gram range, caches the TF-IDF
+# matrix on disk and runs a cross-validated search over
+# (n-gram range, C, solver) on a process pool. Workers memory-map the cached
+# matrices instead of re-vectorizing for every configuration. Workers are
+# single-threaded and reused across configurations; on Linux the peak RSS is
+# reset before each fit, so it is still per configuration.
+#
+# Usage:
+#   python train.py data.csv
+#   python train.py data.csv --folds 5 --workers 8 --cache-dir .cache
+#   python train.py data.csv --fresh-workers   # new process per config (slower start)
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import random
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold, cross_val_score
+from threadpoolctl import threadpool_limits
+
+from disease_predictor import (
+    HERE, MODEL_PATH, VECTORIZER_PATH, DISEASE_INFO_PATH, DISEASE_COL,
+    load_dataset, augment_combinations, build_disease_info,
+)
+
+NGRAM_RANGES = [(1, 1), (1, 2), (1, 3)]
+C_VALUES = [0.1, 1.0, 10.0]
+SOLVERS = ['lbfgs', 'saga', 'newton-cg']
+MAX_ITER = 2000
+# the notebook's settings, used when no search results are given
+DEFAULT_CONFIG = {'ngram_range': (1, 2), 'C': 1.0, 'solver': 'lbfgs'}
+
+
+def make_vectorizer(ngram_range):
+    return TfidfVectorizer(ngram_range=tuple(ngram_range))
+
+def make_model(config, max_iter=MAX_ITER):
+    return LogisticRegression(C=config['C'], solver=config['solver'], max_iter=max_iter)
+
+def best_config(results_path):
+    # best entry of a search_results.json written by main()
+    with open(results_path) as f:
+        best = json.load(f)[0]
+    return {'ngram_range': tuple(best['ngram_range']), 'C': best['C'], 'solver': best['solver']}
+
+
+# -------------------------
+# 1) Build training text (same as the notebook)
+# -------------------------
+def build_training_data(csv_path, max_per_disease=50, seed=42):
+    random.seed(seed)
+    df = load_dataset(csv_path)
+    augmented = augment_combinations(df, max_per_disease=max_per_disease)
+    train_df = augmented.sample(frac=1, random_state=seed).reset_index(drop=True)
+    X_text = train_df['symptom_text'].fillna('')
+    y = train_df[DISEASE_COL].to_numpy()
+    return df, X_text, y
+
+
+# -------------------------
+# 2) Cache one TF-IDF matrix per n-gram range
+# -------------------------
+def cache_matrices(X_text, y, cache_dir, ngram_ranges=NGRAM_RANGES):
+    os.makedirs(cache_dir, exist_ok=True)
+    digest = hashlib.sha1('\n'.join(X_text).encode('utf-8')).hexdigest()[:12]
+    paths = {}
+    for ngram in ngram_ranges:
+        path = os.path.join(cache_dir, f"tfidf_{digest}_{ngram[0]}-{ngram[1]}.joblib")
+        if not os.path.exists(path):
+            vectorizer = make_vectorizer(ngram)
+            X = vectorizer.fit_transform(X_text)
+            joblib.dump({'X': X, 'y': y, 'vectorizer': vectorizer}, path)
+            print(f"Cached {ngram} -> {path} ({X.shape[1]} features)")
+        paths[ngram] = path
+    return paths
+
+
+# -------------------------
+# 3) Evaluate one configuration (runs in a worker process)
+# -------------------------
+def _reset_peak_rss():
+    # Linux (4.0+) resets the process's peak RSS (VmHWM) when "5" is written here
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+def _peak_rss_mb():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # elsewhere: peak of the whole worker so far (in KiB on Linux, bytes on macOS)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _init_worker():
+    # one BLAS/OpenMP thread per worker; the pool already uses every core
+    threadpool_limits(1)
+
+def evaluate_config(config, path, folds=5, seed=42):
+    # mmap_mode lets every worker share the cached sparse arrays' pages
+    cached = joblib.load(path, mmap_mode='r')
+    model = make_model(config)
+    cv = StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed)
+
+    _reset_peak_rss()
+    rss_before = _peak_rss_mb()
+    start = time.perf_counter()
+    scores = cross_val_score(model, cached['X'], cached['y'], cv=cv, n_jobs=1)
+    wall_time = time.perf_counter() - start
+    peak = _peak_rss_mb()
+
+    return {
+        **config,
+        'ngram_range': list(config['ngram_range']),
+        'accuracy': float(np.mean(scores)),
+        'accuracy_std': float(np.std(scores)),
+        'wall_time_s': wall_time,
+        'peak_rss_mb': peak,
+        'fit_rss_mb': peak - rss_before,
+    }
+
+
+# -------------------------
+# 4) Search over every configuration using all cores
+# -------------------------
+def search(paths, folds=5, seed=42, workers=None,
+           c_values=C_VALUES, solvers=SOLVERS, fresh_workers=False):
+    configs = [
+        {'ngram_range': ngram, 'C': C, 'solver': solver}
+        for ngram, C, solver in itertools.product(paths, c_values, solvers)
+    ]
+    results = []
+    # fresh_workers: a new process per configuration (max_tasks_per_child=1) gives
+    # exact peak RSS even where it can't be reset, but every configuration then
+    # pays a new interpreter + the sklearn/pandas imports + loading its matrix
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker,
+                             max_tasks_per_child=1 if fresh_workers else None) as pool:
+        futures = [
+            pool.submit(evaluate_config, config, paths[config['ngram_range']], folds, seed)
+            for config in configs
+        ]
+        for future in as_completed(futures):
+            r = future.result()
+            print(f"ngram={tuple(r['ngram_range'])} C={r['C']} solver={r['solver']}: "
+                  f"acc={r['accuracy']:.4f} time={r['wall_time_s']:.2f}s "
+                  f"peak_rss={r['peak_rss_mb']:.1f}MB (+{r['fit_rss_mb']:.1f}MB)")
+            results.append(r)
+    results.sort(key=lambda r: (-r['accuracy'], r['wall_time_s']))
+    return results
+
+
+# -------------------------
+# 5) Refit the winner and save in the serving format
+# -------------------------
+def export_best(best, paths, model_path=MODEL_PATH, vectorizer_path=VECTORIZER_PATH):
+    cached = joblib.load(paths[tuple(best['ngram_range'])])
+    model = make_model(best)
+    model.fit(cached['X'], cached['y'])
+    joblib.dump(model, model_path)
+    joblib.dump(cached['vectorizer'], vectorizer_path)
+    print(f"Saved -> {model_path}, {vectorizer_path}")
+    return model, cached['vectorizer']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the disease predictor with a parallel CV search")
+    parser.add_argument('csv_path')
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=None, help="default: all cores")
+    parser.add_argument('--max-per-disease', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--cache-dir', default=os.path.join(HERE, '.cache'))
+    parser.add_argument('--results', default=os.path.join(HERE, 'search_results.json'))
+    parser.add_argument('--fresh-workers', action='store_true',
+                        help="new process per configuration; slower, exact peak RSS on any OS")
+    args = parser.parse_args()
+
+    df, X_text, y = build_training_data(args.csv_path, args.max_per_disease, args.seed)
+    print("Training rows:", len(X_text))
+
+    paths = cache_matrices(X_text, y, args.cache_dir)
+    results = search(paths, folds=args.folds, seed=args.seed, workers=args.workers,
+                     fresh_workers=args.fresh_workers)
+
+    with open(args.results, 'w') as f:
+        json.dump(results, f, indent=2)
+    print("Results ->", args.results)
+
+    best = results[0]
+    print("Best:", best)
+    export_best(best, paths)
+    joblib.dump(build_disease_info(df), DISEASE_INFO_PATH)
+    print("Saved ->", DISEASE_INFO_PATH)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# Production launcher: gunicorn -c gunicorn.conf.py main:app
+import gc
+import glob
+import multiprocessing
+import os
+
+# metrics from all workers are written here and added up on /metrics; this has
+# to be set before prometheus_client is imported (by main.py or below).
+METRICS_DIR = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.abspath("prometheus_multiproc"))
+os.makedirs(METRICS_DIR, exist_ok=True)
+# Counts left over from a previous run would be added to this one, so remove
+# them - only prometheus_client's *.db files, the directory may be shared.
+# Done here rather than in on_starting, which gunicorn only calls after
+# preloading the app. gunicorn runs this file again on every HUP reload, when
+# the running workers' files must stay, so only on the first start.
+if not os.environ.get("SEHATRRA_METRICS_DIR_CLEANED"):
+    for path in glob.glob(os.path.join(METRICS_DIR, "*.db")):
+        os.remove(path)
+    os.environ["SEHATRRA_METRICS_DIR_CLEANED"] = "1"
+
+from prometheus_client import multiprocess
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+# prediction is CPU-bound, so one worker per core
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+threads = int(os.environ.get("THREADS", 2))
+timeout = 30
+
+# load main.py (and the model) once in the master, then fork the workers
+preload_app = True
+
+# in-memory sessions would be separate in every worker, so share them through SQLite
+raw_env = [
+    "SESSION_BACKEND=" + os.environ.get("SESSION_BACKEND", "sqlite"),
+    "SESSION_SQLITE_PATH=" + os.environ.get("SESSION_SQLITE_PATH", "sessions.db"),
+]
+
+
+def child_exit(server, worker):
+    # drop the dead worker's in-progress gauge; its counters are kept
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def when_ready(server):
+    # keep the garbage collector from touching the preloaded objects, which
+    # would copy their pages into every worker
+    gc.freeze()
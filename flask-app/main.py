@@ -1,10 +1,22 @@
 from flask import Flask, redirect, url_for, render_template, request, session
 
-from datatime import timedelta
+from datetime import timedelta
+import os
+
+from sessions import init_sessions
+from metrics import init_metrics
+from predict import init_predictor
 
-app.permanent_session_lifetime= timedelta(minutes=5)
 app = Flask(__name__)
 app.secret_key=""
+app.permanent_session_lifetime= timedelta(minutes=5)
+app.config["SESSION_BACKEND"] = os.environ.get("SESSION_BACKEND", "memory")
+app.config["SESSION_SQLITE_PATH"] = os.environ.get("SESSION_SQLITE_PATH", "sessions.db")
+session_store = init_sessions(app)
+app.config["METRICS_PROFILE_RATE"] = float(os.environ.get("METRICS_PROFILE_RATE", "0"))
+app.config["METRICS_SLOW_SECONDS"] = float(os.environ.get("METRICS_SLOW_SECONDS", "1"))
+metrics = init_metrics(app)
+predictor = init_predictor(app)
 
 @app.route("/")
 def home():
@@ -13,6 +25,7 @@ def home():
 @app.route("/login", methods=["POST", "GET"])
 def login():
     if request.method == "POST":
+        session.regenerate()
         session.permanent = True
         user = request.form["nm"]
         session["user"] = user
@@ -28,10 +41,11 @@ def user():
     else:
         if "user" in session:
             return redirect(url_for("user"))
-        return redirect(url_for("login.html"))
+        return redirect(url_for("login"))
 @app.route("/logout")
 def logout():
     session.pop("user",None)
     return redirect(url_for("login"))
 if __name__=="__main__":
-    app.run(debug=True,port=8000)
+    # development server only; in production run: gunicorn -c gunicorn.conf.py main:app
+    app.run(debug=os.environ.get("FLASK_DEBUG") == "1",port=8000)
@@ -0,0 +1,129 @@
+# Request timing for the Flask app, shown in Prometheus text format on /metrics.
+# Records per endpoint: latency histogram, status code counts, requests in flight,
+# plus template render time. Can also save cProfile dumps of a sample of slow requests.
+#
+# With several gunicorn workers, set PROMETHEUS_MULTIPROC_DIR (gunicorn.conf.py
+# does) before prometheus_client is imported. Every worker then writes its
+# values to mmap files in that directory, and /metrics adds all workers up, so
+# any worker can answer a scrape.
+
+import cProfile
+import os
+import random
+import time
+
+from flask import Response, g, request, before_render_template, template_rendered
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest,
+)
+from prometheus_client import multiprocess
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def multiprocess_enabled():
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+class RequestMetrics:
+    def __init__(self, profile_rate=0.0, slow_seconds=1.0, profile_dir="profiles"):
+        self.profile_rate = profile_rate
+        self.slow_seconds = slow_seconds
+        self.profile_dir = profile_dir
+        self.registry = CollectorRegistry()
+        self.latency = Histogram(
+            "flask_request_duration_seconds", "Request latency by endpoint.",
+            ["endpoint"], buckets=BUCKETS, registry=self.registry)
+        self.statuses = Counter(
+            "flask_requests", "Finished requests by endpoint, method and status.",
+            ["endpoint", "method", "status"], registry=self.registry)
+        self.in_flight = Gauge(
+            "flask_requests_in_progress", "Requests currently being handled.",
+            multiprocess_mode="livesum", registry=self.registry)
+        self.renders = Histogram(
+            "flask_template_render_seconds", "Template render time.",
+            ["template"], buckets=BUCKETS, registry=self.registry)
+
+    # -------------------------
+    # Flask hooks
+    # -------------------------
+    def before_request(self):
+        self.in_flight.inc()
+        g._metrics_in_flight = True
+        g._metrics_start = time.perf_counter()
+        if self.profile_rate and random.random() < self.profile_rate:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # another request on this process is already being profiled
+                return
+            g._metrics_profiler = profiler
+
+    def after_request(self, response):
+        start = g.pop("_metrics_start", None)
+        if start is None:
+            return response
+        elapsed = time.perf_counter() - start
+        endpoint = request.endpoint or "unknown"
+        self.latency.labels(endpoint).observe(elapsed)
+        self.statuses.labels(endpoint, request.method, str(response.status_code)).inc()
+
+        profiler = g.pop("_metrics_profiler", None)
+        if profiler is not None:
+            profiler.disable()
+            if elapsed >= self.slow_seconds:
+                os.makedirs(self.profile_dir, exist_ok=True)
+                name = f"{endpoint}-{int(time.time() * 1000)}-{os.getpid()}.prof"
+                profiler.dump_stats(os.path.join(self.profile_dir, name))
+        return response
+
+    def teardown_request(self, exc):
+        # runs even when the request failed, so the gauge can't drift
+        if g.pop("_metrics_in_flight", False):
+            self.in_flight.dec()
+        profiler = g.pop("_metrics_profiler", None)
+        if profiler is not None:
+            profiler.disable()
+
+    def before_render(self, sender, template, context, **extra):
+        g._metrics_render_start = time.perf_counter()
+
+    def after_render(self, sender, template, context, **extra):
+        start = g.pop("_metrics_render_start", None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        self.renders.labels(template.name or "unknown").observe(elapsed)
+
+    # -------------------------
+    # Prometheus text output
+    # -------------------------
+    def render(self):
+        if multiprocess_enabled():
+            # sum the files written by every worker, not just this one
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = self.registry
+        return generate_latest(registry)
+
+    def metrics_view(self):
+        return Response(self.render(), content_type=CONTENT_TYPE_LATEST)
+
+
+def init_metrics(app):
+    # METRICS_PROFILE_RATE = fraction of requests to profile (0 = off)
+    # METRICS_SLOW_SECONDS = only keep profiles of requests slower than this
+    metrics = RequestMetrics(
+        profile_rate=app.config.get("METRICS_PROFILE_RATE", 0.0),
+        slow_seconds=app.config.get("METRICS_SLOW_SECONDS", 1.0),
+        profile_dir=app.config.get("METRICS_PROFILE_DIR", "profiles"),
+    )
+    app.before_request(metrics.before_request)
+    app.after_request(metrics.after_request)
+    app.teardown_request(metrics.teardown_request)
+    before_render_template.connect(metrics.before_render, app)
+    template_rendered.connect(metrics.after_render, app)
+    app.add_url_rule("/metrics", "metrics", metrics.metrics_view)
+    return metrics
@@ -0,0 +1,100 @@
+# Disease prediction API, serving the Sehatrra AI model.
+#   POST /predict        {"symptoms": "fever, cough", "k": 3}
+#   POST /predict/batch  ["fever, cough", "headache"]   (k from ?k=3)
+# The model, vectorizer and disease info are loaded when the app is imported.
+# Under gunicorn with preload_app the master loads them once and the forked
+# workers share those memory pages instead of each loading its own copy.
+
+import os
+import sys
+
+from flask import jsonify, request
+
+AI_DIR = os.environ.get(
+    "SEHATRRA_AI_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Sehatrra",
+                 "Sehatrra AI - Symptom to Disease Detector", "AI"),
+)
+MAX_BATCH = 1000
+MAX_CONTENT_LENGTH = 1024 * 1024   # request bodies over 1 MB are rejected with 413
+
+
+class Predictor:
+    def __init__(self, ai_dir=AI_DIR):
+        if ai_dir not in sys.path:
+            sys.path.insert(0, ai_dir)
+        from disease_predictor import load_artifacts, load_disease_info, predict_top_k
+        from symptom_matcher import SymptomMatcher
+
+        self.model, self.vectorizer = load_artifacts(
+            os.path.join(ai_dir, "disease_model.pkl"), os.path.join(ai_dir, "vectorizer.pkl"))
+        self.disease_info = load_disease_info(os.path.join(ai_dir, "disease_info.pkl"))
+        self.matcher = SymptomMatcher(self.disease_info["symptoms"])
+        self._predict_top_k = predict_top_k
+
+    def tokens(self, symptom_text):
+        return self.matcher.normalize(symptom_text)
+
+    def predict(self, symptom_texts, k=3):
+        return self._predict_top_k(symptom_texts, self.model, self.vectorizer,
+                                   self.disease_info, k=k, matcher=self.matcher)
+
+
+def _error(message, status):
+    return jsonify({"error": message}), status
+
+
+def init_predictor(app):
+    # Flask's default is None (no limit); MAX_BATCH alone doesn't bound the body size
+    if app.config.get("MAX_CONTENT_LENGTH") is None:
+        app.config["MAX_CONTENT_LENGTH"] = MAX_CONTENT_LENGTH
+    try:
+        predictor = Predictor(app.config.get("SEHATRRA_AI_DIR", AI_DIR))
+    except (FileNotFoundError, ImportError) as e:
+        # the login pages still work; /predict answers 503 until the model is trained
+        app.logger.warning("Disease model not loaded: %s", e)
+        predictor = None
+
+    def get_k(value):
+        try:
+            return max(1, int(value))
+        except (TypeError, ValueError):
+            return 3
+
+    def predict():
+        if predictor is None:
+            return _error("model not loaded", 503)
+        body = request.get_json(silent=True)
+        if not isinstance(body, dict):
+            body = {}
+        symptoms = body.get("symptoms", request.args.get("symptoms"))
+        if not isinstance(symptoms, str) or not predictor.tokens(symptoms):
+            return _error('expected {"symptoms": "fever, cough"}', 400)
+        k = get_k(body.get("k", request.args.get("k")))
+        result = predictor.predict([symptoms], k)[0]
+        if not result["predictions"]:
+            return _error("none of these symptoms are known to the model", 400)
+        return jsonify(result)
+
+    def predict_batch():
+        if predictor is None:
+            return _error("model not loaded", 503)
+        items = request.get_json(silent=True)
+        if not isinstance(items, list) or not all(isinstance(s, str) for s in items):
+            return _error('expected a JSON list like ["fever, cough", "headache"]', 400)
+        if len(items) > MAX_BATCH:
+            return _error(f"batch too large (max {MAX_BATCH})", 413)
+        if not items:
+            return jsonify([])
+        empty = [i for i, s in enumerate(items) if not predictor.tokens(s)]
+        if empty:
+            return _error(f"items without symptoms: {empty}", 400)
+        results = predictor.predict(items, get_k(request.args.get("k")))
+        unknown = [i for i, r in enumerate(results) if not r["predictions"]]
+        if unknown:
+            return _error(f"items with no symptom known to the model: {unknown}", 400)
+        return jsonify(results)
+
+    app.add_url_rule("/predict", "predict", predict, methods=["GET", "POST"])
+    app.add_url_rule("/predict/batch", "predict_batch", predict_batch, methods=["POST"])
+    return predictor
@@ -0,0 +1,244 @@
+# Server-side sessions for the Flask app.
+# The browser cookie only holds a random session id; the data lives in a store:
+#   MemoryStore - in-process LRU dict with a background thread that removes expired sessions
+#   SqliteStore - SQLite file, so several worker processes can share sessions
+# Stored sessions are only rewritten when they change or when more than half of
+# their lifetime has passed, not on every request.
+
+import json
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+logger = logging.getLogger(__name__)
+
+
+class ServerSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, new=False, expires=None):
+        def on_update(self):
+            self.modified = True
+            self.accessed = True
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.expires = expires
+        self.old_sid = None
+        self.modified = False
+        self.accessed = False
+
+    # reading the session also makes the response depend on the cookie
+    def __getitem__(self, key):
+        self.accessed = True
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self.accessed = True
+        return super().get(key, default)
+
+    def setdefault(self, key, default=None):
+        self.accessed = True
+        return super().setdefault(key, default)
+
+    def __contains__(self, key):
+        self.accessed = True
+        return super().__contains__(key)
+
+    def regenerate(self):
+        # new id on login, so an id planted before login (session fixation) is useless
+        if self.old_sid is None:
+            self.old_sid = self.sid
+        self.sid = secrets.token_urlsafe(32)
+        self.modified = True
+
+
+# -------------------------
+# Stores
+# -------------------------
+class MemoryStore:
+    # OrderedDict keeps least recently used first, so lookups and evictions are O(1)
+    def __init__(self, max_sessions=10000, sweep_interval=60):
+        self.max_sessions = max_sessions
+        self.sweep_interval = sweep_interval
+        self._sweeper_pid = None
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, sid):
+        _start_sweeper(self)
+        with self._lock:
+            item = self._data.get(sid)
+            if item is None:
+                return None
+            data, expires = item
+            if expires < time.time():
+                del self._data[sid]
+                return None
+            self._data.move_to_end(sid)
+            return data, expires
+
+    def set(self, sid, data, expires):
+        _start_sweeper(self)
+        with self._lock:
+            self._data[sid] = (data, expires)
+            self._data.move_to_end(sid)
+            while len(self._data) > self.max_sessions:
+                self._data.popitem(last=False)
+
+    def delete(self, sid):
+        with self._lock:
+            self._data.pop(sid, None)
+
+    def sweep(self):
+        now = time.time()
+        with self._lock:
+            expired = [sid for sid, (_, expires) in self._data.items() if expires < now]
+            for sid in expired:
+                del self._data[sid]
+        return len(expired)
+
+    def active_sessions(self):
+        with self._lock:
+            return list(self._data)
+
+
+class SqliteStore:
+    def __init__(self, path="sessions.db", sweep_interval=60):
+        self.path = path
+        self.sweep_interval = sweep_interval
+        self._sweeper_pid = None
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute("CREATE TABLE IF NOT EXISTS sessions (sid TEXT PRIMARY KEY, data TEXT, expires REAL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS sessions_expires ON sessions (expires)")
+        conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _db(self):
+        # one connection per thread and process; sqlite3 connections can't be shared
+        if getattr(self._local, "pid", None) != os.getpid():
+            self._local.conn = self._connect()
+            self._local.pid = os.getpid()
+        return self._local.conn
+
+    def get(self, sid):
+        _start_sweeper(self)
+        row = self._db().execute(
+            "SELECT data, expires FROM sessions WHERE sid = ? AND expires >= ?",
+            (sid, time.time())).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def set(self, sid, data, expires):
+        _start_sweeper(self)
+        self._db().execute(
+            "INSERT OR REPLACE INTO sessions (sid, data, expires) VALUES (?, ?, ?)",
+            (sid, json.dumps(data), expires))
+
+    def delete(self, sid):
+        self._db().execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+
+    def sweep(self):
+        return self._db().execute("DELETE FROM sessions WHERE expires < ?", (time.time(),)).rowcount
+
+    def active_sessions(self):
+        rows = self._db().execute("SELECT sid FROM sessions WHERE expires >= ?", (time.time(),))
+        return [row[0] for row in rows]
+
+
+_sweeper_lock = threading.Lock()
+
+def _start_sweeper(store):
+    # started lazily in each process: threads don't survive a fork, so a sweeper
+    # started before gunicorn forks its workers would only run in the master
+    if not store.sweep_interval or store._sweeper_pid == os.getpid():
+        return
+    with _sweeper_lock:
+        if store._sweeper_pid == os.getpid():
+            return
+        store._sweeper_pid = os.getpid()
+
+    def sweep_forever():
+        while True:
+            time.sleep(store.sweep_interval)
+            try:
+                store.sweep()
+            except Exception:
+                # e.g. "database is locked" under load; try again next round
+                logger.exception("Session sweep failed")
+    threading.Thread(target=sweep_forever, daemon=True).start()
+
+
+# -------------------------
+# Flask session interface
+# -------------------------
+class ServerSessionInterface(SessionInterface):
+    def __init__(self, store):
+        self.store = store
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            item = self.store.get(sid)
+            if item is not None:
+                data, expires = item
+                return ServerSession(data, sid=sid, expires=expires)
+        return ServerSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        # same as Flask's cookie sessions: if the session was used, caches must
+        # not share this response between users
+        if session.accessed:
+            response.vary.add("Cookie")
+
+        if session.old_sid is not None:
+            self.store.delete(session.old_sid)
+
+        if not session:
+            if session.modified:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        # only touch the store when something changed or half the lifetime has passed
+        lifetime = app.permanent_session_lifetime.total_seconds()
+        now = time.time()
+        if not session.modified and session.expires is not None \
+                and session.expires - now > lifetime / 2:
+            return
+        self.store.set(session.sid, dict(session), now + lifetime)
+        response.set_cookie(
+            name, session.sid,
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain, path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+
+
+def init_sessions(app):
+    # SESSION_BACKEND = "memory" (default) or "sqlite"
+    backend = app.config.get("SESSION_BACKEND", "memory")
+    sweep_interval = app.config.get("SESSION_SWEEP_INTERVAL", 60)
+    if backend == "sqlite":
+        store = SqliteStore(app.config.get("SESSION_SQLITE_PATH", "sessions.db"), sweep_interval)
+    elif backend == "memory":
+        store = MemoryStore(app.config.get("SESSION_MAX_ENTRIES", 10000), sweep_interval)
+    else:
+        raise ValueError(f"Unknown SESSION_BACKEND: {backend}")
+    app.session_interface = ServerSessionInterface(store)
+    return store
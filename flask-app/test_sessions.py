@@ -0,0 +1,66 @@
+import time
+
+from main import app, session_store
+from sessions import MemoryStore, SqliteStore
+
+
+def login(client, name="alice"):
+    client.post("/login", data={"nm": name})
+    return client.get_cookie("session").value
+
+
+def test_login_issues_a_new_session_id():
+    client = app.test_client()
+    old_sid = login(client)
+    new_sid = login(client, "bob")
+    assert new_sid != old_sid
+    assert session_store.get(old_sid) is None
+    assert session_store.get(new_sid)[0]["user"] == "bob"
+
+    # the old id no longer logs anyone in
+    attacker = app.test_client()
+    attacker.set_cookie("session", old_sid)
+    assert attacker.get("/user").status_code == 302
+
+
+def test_reading_the_session_adds_vary_cookie():
+    client = app.test_client()
+    login(client)
+    response = client.get("/user")
+    assert response.data == b"<h1>alice</h1>"
+    assert "Cookie" in response.vary
+
+
+def test_unchanged_session_is_only_refreshed_after_half_its_lifetime():
+    client = app.test_client()
+    sid = login(client)
+    assert "Set-Cookie" not in client.get("/user").headers
+
+    # pretend most of the lifetime has passed
+    data, _ = session_store.get(sid)
+    session_store.set(sid, data, time.time() + 10)
+    assert "Set-Cookie" in client.get("/user").headers
+    _, expires = session_store.get(sid)
+    assert expires > time.time() + app.permanent_session_lifetime.total_seconds() - 10
+
+
+def test_memory_store_evicts_least_recently_used():
+    store = MemoryStore(max_sessions=2, sweep_interval=0)
+    later = time.time() + 60
+    store.set("a", {}, later)
+    store.set("b", {}, later)
+    store.get("a")
+    store.set("c", {}, later)
+    assert store.get("b") is None
+    assert sorted(store.active_sessions()) == ["a", "c"]
+
+
+def test_expired_sessions_are_not_returned(tmp_path):
+    for store in (MemoryStore(sweep_interval=0),
+                  SqliteStore(str(tmp_path / "sessions.db"), sweep_interval=0)):
+        store.set("old", {"user": "alice"}, time.time() - 1)
+        store.set("new", {"user": "bob"}, time.time() + 60)
+        assert store.get("old") is None
+        assert store.get("new")[0] == {"user": "bob"}
+        store.sweep()
+        assert store.active_sessions() == ["new"]